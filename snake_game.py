@@ -1,8 +1,10 @@
 import pygame
 import random
 import os
+import time
+import statistics
 from enum import Enum
-from collections import namedtuple
+from collections import namedtuple, deque
 
 # Initialize pygame
 pygame.init()
@@ -22,28 +24,161 @@ class Direction(Enum):
     UP = 3
     DOWN = 4
 
+# Column/row offsets for each direction
+DELTAS = {
+    Direction.RIGHT: (1, 0),
+    Direction.LEFT: (-1, 0),
+    Direction.UP: (0, -1),
+    Direction.DOWN: (0, 1),
+}
+
 # Define Point
 Point = namedtuple('Point', 'x, y')
 
+# State a tick overwrote, kept so the tick can be undone
+# (tail is the popped cell, or None when the snake grew or crashed;
+# meals is the meal count before the tick, which fixes the next food)
+Delta = namedtuple('Delta', 'head, direction, tail, food, score, meals')
+
 # Game settings
 BLOCK_SIZE = 20
 SPEED = 8
+REWIND_TICKS = 600
+
+# Difficulty: speed rises by SPEED_STEP every POINTS_PER_LEVEL points
+POINTS_PER_LEVEL = 5
+SPEED_STEP = 2
+MAX_SPEED = 30
+
+# Tick pacing: busy-wait at and above this rate, since sleeping is too coarse
+BUSY_LOOP_SPEED = 20
+# Renders that may be skipped in a row when frames overrun
+MAX_SKIPPED_RENDERS = 5
+# Tick intervals and pacing errors kept for the jitter report
+JITTER_SAMPLES = 240
+
+
+def food_rng(seed, meals):
+    """RNG for the food placed after `meals` meals in a game with the given seed"""
+    return random.Random(seed * 1000003 + meals)
+
+
+class TickScheduler:
+    """Paces game ticks, raising speed with the level and skipping renders on overrun"""
+    
+    def __init__(self, clock, base_speed=SPEED, speed_step=SPEED_STEP,
+                 points_per_level=POINTS_PER_LEVEL, max_speed=MAX_SPEED,
+                 time_func=time.perf_counter):
+        self.clock = clock
+        self.base_speed = base_speed
+        self.speed_step = speed_step
+        self.points_per_level = points_per_level
+        self.max_speed = max_speed
+        self.time_func = time_func
+        
+        self.intervals = deque(maxlen=JITTER_SAMPLES)
+        self.errors = deque(maxlen=JITTER_SAMPLES)
+        self.frame_costs = deque(maxlen=JITTER_SAMPLES)
+        self.last_tick = None
+        self.ticks = 0
+        self.overruns = 0
+        self.renders_skipped = 0
+        self.skipped_in_row = 0
+        self.behind = False
+    
+    def pause(self):
+        """Forget the last tick so time spent outside play is not measured"""
+        self.last_tick = None
+        self.behind = False
+        self.skipped_in_row = 0
+    
+    def level(self, score):
+        """Level reached at the given score, starting from 1"""
+        return score // self.points_per_level + 1
+    
+    def speed(self, score):
+        """Ticks per second for the given score"""
+        speed = self.base_speed + (self.level(score) - 1) * self.speed_step
+        return min(speed, self.max_speed)
+    
+    def should_render(self):
+        """Whether to draw this tick; renders are dropped after an overrun, logic never is"""
+        if self.behind and self.skipped_in_row < MAX_SKIPPED_RENDERS:
+            self.skipped_in_row += 1
+            self.renders_skipped += 1
+            return False
+        self.skipped_in_row = 0
+        return True
+    
+    def wait(self, score):
+        """Block until the next tick is due and record frame cost, interval and pacing error"""
+        speed = self.speed(score)
+        interval = 1.0 / speed
+        
+        if self.last_tick is not None:
+            frame_cost = self.time_func() - self.last_tick
+            self.frame_costs.append(frame_cost)
+            self.behind = frame_cost > interval
+            if self.behind:
+                self.overruns += 1
+        
+        if speed >= BUSY_LOOP_SPEED:
+            self.clock.tick_busy_loop(speed)
+        else:
+            self.clock.tick(speed)
+        
+        now = self.time_func()
+        if self.last_tick is not None:
+            self.intervals.append(now - self.last_tick)
+            # Error against this tick's own target, so speed-ups are not jitter
+            self.errors.append(now - self.last_tick - interval)
+        self.last_tick = now
+        self.ticks += 1
+    
+    def jitter_report(self):
+        """Summarise recent pacing in milliseconds"""
+        report = {
+            'ticks': self.ticks,
+            'overruns': self.overruns,
+            'renders_skipped': self.renders_skipped,
+        }
+        if self.intervals:
+            report['mean_interval_ms'] = statistics.mean(i * 1000 for i in self.intervals)
+            errors = [e * 1000 for e in self.errors]
+            report['mean_error_ms'] = statistics.mean(errors)
+            report['jitter_ms'] = statistics.pstdev(errors)
+            report['max_deviation_ms'] = max(abs(e) for e in errors)
+        if self.frame_costs:
+            costs = [c * 1000 for c in self.frame_costs]
+            report['mean_frame_cost_ms'] = statistics.mean(costs)
+            report['max_frame_cost_ms'] = max(costs)
+        return report
 
 class SnakeGame:
-    def __init__(self, width=640, height=480):
+    def __init__(self, width=640, height=480, rewind_ticks=REWIND_TICKS,
+                 headless=False, seed=None, speed=SPEED):
         self.width = width
         self.height = height
+        self.rewind_ticks = rewind_ticks
+        self.headless = headless
         
-        # Initialize display
-        self.display = pygame.display.set_mode((self.width, self.height))
-        pygame.display.set_caption('Snake Game')
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
+        # Food seed; a fixed seed makes the food sequence repeatable,
+        # otherwise every reset draws a fresh one
+        self.fixed_seed = seed
+        
+        # Initialize display (headless games only drive the logic via step)
+        if not self.headless:
+            self.display = pygame.display.set_mode((self.width, self.height))
+            pygame.display.set_caption('Snake Game')
+            self.clock = pygame.time.Clock()
+            self.scheduler = TickScheduler(self.clock, base_speed=speed)
+            self.font = pygame.font.Font(None, 36)
         
         # Load scores from file
         self.best_score = 0
         self.last_score = 0
-        self._load_scores()
+        if not self.headless:
+            self._load_scores()
         
         # Initialize game state
         self.reset()
@@ -85,14 +220,28 @@ class SnakeGame:
         ]
         
         self.score = 0
+        self.seed = self.fixed_seed if self.fixed_seed is not None else random.getrandbits(32)
+        self.meals = 0
         self.food = None
         self._place_food()
+        
+        # Ring buffer of per-tick deltas, oldest dropped first
+        self.history = deque(maxlen=self.rewind_ticks)
+        
+        # Time spent on menus between games is not a frame
+        if not self.headless:
+            self.scheduler.pause()
     
     def _place_food(self):
         """Place food at random location not occupied by snake"""
+        # No free cell left once the snake fills the board
+        if len(self.snake) >= (self.width // BLOCK_SIZE) * (self.height // BLOCK_SIZE):
+            self.food = None
+            return
+        rng = food_rng(self.seed, self.meals)
         while True:
-            x = random.randint(0, (self.width - BLOCK_SIZE) // BLOCK_SIZE) * BLOCK_SIZE
-            y = random.randint(0, (self.height - BLOCK_SIZE) // BLOCK_SIZE) * BLOCK_SIZE
+            x = rng.randint(0, (self.width - BLOCK_SIZE) // BLOCK_SIZE) * BLOCK_SIZE
+            y = rng.randint(0, (self.height - BLOCK_SIZE) // BLOCK_SIZE) * BLOCK_SIZE
             self.food = Point(x, y)
             if self.food not in self.snake:
                 break
@@ -100,57 +249,104 @@ class SnakeGame:
     def play_step(self):
         """Execute one game step"""
         # 1. Collect user input
+        direction = self.direction
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 quit()
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_LEFT and self.direction != Direction.RIGHT:
-                    self.direction = Direction.LEFT
-                elif event.key == pygame.K_RIGHT and self.direction != Direction.LEFT:
-                    self.direction = Direction.RIGHT
-                elif event.key == pygame.K_UP and self.direction != Direction.DOWN:
-                    self.direction = Direction.UP
-                elif event.key == pygame.K_DOWN and self.direction != Direction.UP:
-                    self.direction = Direction.DOWN
-        
-        # 2. Move snake
+                if event.key == pygame.K_LEFT and direction != Direction.RIGHT:
+                    direction = Direction.LEFT
+                elif event.key == pygame.K_RIGHT and direction != Direction.LEFT:
+                    direction = Direction.RIGHT
+                elif event.key == pygame.K_UP and direction != Direction.DOWN:
+                    direction = Direction.UP
+                elif event.key == pygame.K_DOWN and direction != Direction.UP:
+                    direction = Direction.DOWN
+        
+        # 2. Advance game logic
+        game_over = self.step(direction)
+        if game_over:
+            return game_over, self.score
+        
+        # 3. Update UI and wait for the next tick
+        if self.scheduler.should_render():
+            self._update_ui()
+        self.scheduler.wait(self.score)
+        
+        return game_over, self.score
+    
+    def step(self, direction=None):
+        """Advance the game logic one tick without input or rendering.
+        
+        Turning back on the snake's own neck is not filtered here and ends
+        the game. Returns True when the move collides.
+        """
+        previous_direction = self.direction
+        previous_head = self.head
+        previous_food = self.food
+        previous_score = self.score
+        previous_meals = self.meals
+        if direction is not None:
+            self.direction = direction
+        
+        # 1. Move snake
         self._move(self.direction)
         self.snake.insert(0, self.head)
         
-        # 3. Check if game over
-        game_over = False
+        # 2. Check if game over
         if self._is_collision():
-            game_over = True
-            return game_over, self.score
+            self.history.append(Delta(previous_head, previous_direction, None,
+                                      previous_food, previous_score, previous_meals))
+            return True
         
-        # 4. Place new food or just move
+        # 3. Place new food or just move
+        tail = None
         if self.head == self.food:
             self.score += 1
+            self.meals += 1
             self._place_food()
         else:
-            self.snake.pop()
-        
-        # 5. Update UI and clock
-        self._update_ui()
-        self.clock.tick(SPEED)
+            tail = self.snake.pop()
         
-        return game_over, self.score
+        self.history.append(Delta(previous_head, previous_direction, tail,
+                                  previous_food, previous_score, previous_meals))
+        return False
+    
+    def rewind(self, ticks=1):
+        """Undo up to `ticks` steps from the history; returns how many were undone"""
+        undone = 0
+        while undone < ticks and self.history:
+            delta = self.history.pop()
+            self.snake.pop(0)
+            if delta.tail is not None:
+                self.snake.append(delta.tail)
+            self.head = delta.head
+            self.direction = delta.direction
+            self.food = delta.food
+            self.score = delta.score
+            self.meals = delta.meals
+            undone += 1
+        return undone
     
     def _is_collision(self, point=None):
         """Check if snake collides with walls or itself"""
+        return self._collision_cause(point) is not None
+    
+    def _collision_cause(self, point=None):
+        """Return 'wall' or 'self' for a colliding point, None otherwise"""
         if point is None:
             point = self.head
         
         # Check boundary collision
         if point.x >= self.width or point.x < 0 or point.y >= self.height or point.y < 0:
-            return True
+            return 'wall'
         
         # Check self collision
         if point in self.snake[1:]:
-            return True
+            return 'self'
         
-        return False
+        return None
     
     def _move(self, direction):
         """Move snake head in given direction"""
@@ -182,8 +378,9 @@ class SnakeGame:
                                pygame.Rect(point.x, point.y, BLOCK_SIZE, BLOCK_SIZE))
         
         # Draw food
-        pygame.draw.rect(self.display, RED, 
-                        pygame.Rect(self.food.x, self.food.y, BLOCK_SIZE, BLOCK_SIZE))
+        if self.food is not None:
+            pygame.draw.rect(self.display, RED, 
+                            pygame.Rect(self.food.x, self.food.y, BLOCK_SIZE, BLOCK_SIZE))
         
         # Draw scores
         score_text = self.font.render(f"Score: {self.score}", True, WHITE)
@@ -195,6 +392,9 @@ class SnakeGame:
         best_score_text = self.font.render(f"Best: {self.best_score}", True, WHITE)
         self.display.blit(best_score_text, [10, 80])
         
+        level_text = self.font.render(f"Level: {self.scheduler.level(self.score)}", True, WHITE)
+        self.display.blit(level_text, [10, 115])
+        
         pygame.display.flip()
     
     def game_over_screen(self):
@@ -295,6 +495,7 @@ def main():
             else:
                 break
     
+    print(f"Tick pacing: {game.scheduler.jitter_report()}")
     pygame.quit()
 
 if __name__ == '__main__':
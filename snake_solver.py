@@ -0,0 +1,263 @@
+import random
+import time
+from collections import OrderedDict, namedtuple
+
+from snake_game import BLOCK_SIZE, DELTAS, food_rng
+
+# Result of a solve: best total score, whether the whole board gets filled,
+# the first move that achieves it and whether the search ran to completion
+SolveResult = namedtuple('SolveResult', 'score, win, direction, complete')
+
+# Ways to treat the food that _place_food drops after every meal
+CHANCE_MODES = ('seed', 'worst', 'expected')
+
+
+class SolverStats:
+    """Progress and transposition table counters for a solver run"""
+
+    def __init__(self):
+        self.nodes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.entries = 0
+        self.positions = 0
+        self.peak_positions = 0
+        self.elapsed = 0.0
+
+    @property
+    def hit_rate(self):
+        """Fraction of table lookups answered from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SnakeSolver:
+    """Exhaustive solver for the maximum score reachable from a SnakeGame state.
+
+    The grid is searched one snake length at a time: every body position
+    reachable before the next meal is enumerated, and each meal recurses into
+    the next length. Results are cached in an LRU transposition table keyed on
+    a Zobrist hash of the body and the food, capped at ``max_entries``.
+
+    Memory is bounded by two limits: ``max_entries`` caps the table, where old
+    entries are evicted and simply recomputed, and ``max_positions`` caps the
+    body positions held by the searches in progress (one set per snake length
+    on the recursion stack). Reaching ``max_positions`` or ``max_nodes`` ends
+    the search early with a lower-bound result marked incomplete.
+
+    Food placement after a meal follows ``chance``:
+      - 'seed': the food ``_place_food`` would place, replayed from the game's
+        seed (or ``seed`` if given) and meal count, so the game is deterministic
+      - 'worst': the least favourable free cell (guaranteed score)
+      - 'expected': the average over all free cells (expected score)
+
+    'seed' mode handles boards from 6x6 to about 10x10 (larger ones need a
+    node budget). The chance-node modes branch over every free cell after
+    every meal and only finish on boards up to about 4x4; on anything
+    bigger they stop at the budget with a partial result.
+    """
+
+    def __init__(self, game, chance='seed', seed=None, max_entries=100000,
+                 max_positions=1000000, max_nodes=None, progress=None,
+                 progress_interval=10000):
+        if chance not in CHANCE_MODES:
+            raise ValueError(f"chance must be one of {CHANCE_MODES}, got {chance!r}")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.cols = game.width // BLOCK_SIZE
+        self.rows = game.height // BLOCK_SIZE
+        self.cells = self.cols * self.rows
+        self.chance = chance
+        self.seed = game.seed if seed is None else seed
+        self.meals = game.meals
+        self.max_entries = max_entries
+        self.max_positions = max_positions
+        self.max_nodes = max_nodes
+        self.progress = progress
+        self.progress_interval = progress_interval
+
+        self.base_score = game.score
+        self.body = tuple(self._cell(point) for point in game.snake)
+        # A full board has no food; it gets the spare slot past the last cell
+        self.food = self.cells if game.food is None else self._cell(game.food)
+
+        self.table = OrderedDict()
+        self.stats = SolverStats()
+        self._exhausted = False
+        self._init_zobrist()
+
+    def _cell(self, point):
+        """Convert a pixel Point to a grid cell index"""
+        return (point.y // BLOCK_SIZE) * self.cols + point.x // BLOCK_SIZE
+
+    def _init_zobrist(self):
+        """Build the random keys used to hash (body, food) positions"""
+        rng = random.Random(0x5EED)
+        # Each body cell is keyed on the direction to the next segment,
+        # with slot 4 marking the tail, so the hash captures body order
+        self._zbody = [[rng.getrandbits(64) for _ in range(5)] for _ in range(self.cells)]
+        self._zhead = [rng.getrandbits(64) for _ in range(self.cells)]
+        self._zfood = [rng.getrandbits(64) for _ in range(self.cells + 1)]
+        self._links = {1: 0, -1: 1, self.cols: 2, -self.cols: 3}
+
+    def _hash(self, body, food):
+        """Zobrist hash of a body and food position"""
+        key = self._zhead[body[0]] ^ self._zfood[food]
+        for i in range(len(body) - 1):
+            key ^= self._zbody[body[i]][self._links[body[i + 1] - body[i]]]
+        return key ^ self._zbody[body[-1]][4]
+
+    def _lookup(self, key):
+        """Fetch a cached value, refreshing its LRU position"""
+        value = self.table.get(key)
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self.table.move_to_end(key)
+        return value
+
+    def _store(self, key, value):
+        """Cache a value, evicting the least recently used entry when full"""
+        self.table[key] = value
+        self.table.move_to_end(key)
+        if len(self.table) > self.max_entries:
+            self.table.popitem(last=False)
+            self.stats.evictions += 1
+        self.stats.entries = len(self.table)
+
+    def _visit(self):
+        """Count a searched node, report progress and enforce the node budget"""
+        self.stats.nodes += 1
+        if self.progress and self.stats.nodes % self.progress_interval == 0:
+            self.progress(self.stats)
+        if self.max_nodes is not None and self.stats.nodes >= self.max_nodes:
+            self._exhausted = True
+
+    def _hold(self, count):
+        """Track positions held by in-progress searches and enforce max_positions"""
+        self.stats.positions += count
+        if self.stats.positions > self.stats.peak_positions:
+            self.stats.peak_positions = self.stats.positions
+        if self.stats.positions > self.max_positions:
+            self._exhausted = True
+
+    def _moves(self, body, food):
+        """Yield (direction, new body) for every move that does not collide"""
+        row, col = divmod(body[0], self.cols)
+        for direction, (dx, dy) in DELTAS.items():
+            x, y = col + dx, row + dy
+            if x < 0 or x >= self.cols or y < 0 or y >= self.rows:
+                continue
+            cell = y * self.cols + x
+            # play_step checks the new head before popping the tail, so the
+            # current tail cell is as deadly as any other body cell
+            if cell in body:
+                continue
+            if cell == food:
+                yield direction, (cell,) + body
+            else:
+                yield direction, (cell,) + body[:-1]
+
+    def _seeded_food(self, body):
+        """Replay _place_food's rejection sampling for a body that has just eaten"""
+        rng = food_rng(self.seed, self.meals + len(body) - len(self.body))
+        occupied = set(body)
+        while True:
+            x = rng.randint(0, self.cols - 1)
+            y = rng.randint(0, self.rows - 1)
+            cell = y * self.cols + x
+            if cell not in occupied:
+                return cell
+
+    def _after_meal(self, body):
+        """Value of a body that has just eaten, over the next food placement"""
+        if len(body) == self.cells:
+            return 0
+        if self.chance == 'seed':
+            return self._value(body, self._seeded_food(body))
+
+        occupied = set(body)
+        free = [cell for cell in range(self.cells) if cell not in occupied]
+        if self.chance == 'worst':
+            worst = None
+            for cell in free:
+                value = self._value(body, cell)
+                if worst is None or value < worst:
+                    worst = value
+                # Nothing is worse than no further points
+                if worst == 0:
+                    break
+            return worst
+        return sum(self._value(body, cell) for cell in free) / len(free)
+
+    def _value(self, body, food):
+        """Most further points reachable from a body and food position"""
+        key = self._hash(body, food)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        # Out of budget: give up without allocating a new search
+        if self._exhausted:
+            return 0
+
+        best = 0
+        ceiling = self.cells - len(body)
+        seen = {body}
+        eaten = set()
+        stack = [body]
+        self._hold(1)
+        while stack and best < ceiling and not self._exhausted:
+            current = stack.pop()
+            self._visit()
+            for _, moved in self._moves(current, food):
+                if self._exhausted:
+                    break
+                if len(moved) > len(current):
+                    if moved not in eaten:
+                        eaten.add(moved)
+                        self._hold(1)
+                        best = max(best, 1 + self._after_meal(moved))
+                elif moved not in seen:
+                    seen.add(moved)
+                    stack.append(moved)
+                    self._hold(1)
+
+        self._hold(-(len(seen) + len(eaten)))
+
+        # A truncated search only gives a lower bound, so keep it out of the table
+        if not self._exhausted:
+            self._store(key, best)
+        return best
+
+    def solve(self):
+        """Search the game state and return a SolveResult"""
+        start = time.perf_counter()
+        self._exhausted = False
+
+        if len(self.body) >= self.cells:
+            return SolveResult(score=self.base_score, win=True, direction=None, complete=True)
+
+        best, best_direction = 0, None
+        for direction, moved in self._moves(self.body, self.food):
+            if len(moved) > len(self.body):
+                value = 1 + self._after_meal(moved)
+            else:
+                value = self._value(moved, self.food)
+            if best_direction is None or value > best:
+                best, best_direction = value, direction
+
+        self.stats.elapsed += time.perf_counter() - start
+        if self.progress:
+            self.progress(self.stats)
+
+        ceiling = self.cells - len(self.body)
+        return SolveResult(
+            score=self.base_score + best,
+            win=best_direction is not None and best >= ceiling,
+            direction=best_direction,
+            complete=not self._exhausted,
+        )
@@ -0,0 +1,295 @@
+import argparse
+import csv
+import importlib
+import math
+import multiprocessing
+import os
+from collections import deque
+
+from snake_game import SnakeGame, Point, BLOCK_SIZE, DELTAS
+
+# Columns written for every finished game
+FIELDS = ['policy', 'seed', 'width', 'height', 'max_ticks', 'score', 'length', 'ticks', 'death']
+
+# Games still running after this many ticks are stopped as 'timeout'
+MAX_TICKS = 5000
+
+# z-score for the 95% confidence interval in the summary
+Z_95 = 1.96
+
+
+def _next_point(game, direction):
+    """Point the head would move to in the given direction"""
+    dx, dy = DELTAS[direction]
+    return Point(game.head.x + dx * BLOCK_SIZE, game.head.y + dy * BLOCK_SIZE)
+
+
+def _safe_moves(game):
+    """Directions whose next head position does not collide"""
+    return [d for d in DELTAS if not game._is_collision(_next_point(game, d))]
+
+
+def _distance_to_food(game, point):
+    return abs(point.x - game.food.x) + abs(point.y - game.food.y)
+
+
+def _free_area(game, start, limit):
+    """Count free cells reachable from start, stopping once limit is reached"""
+    blocked = set(game.snake)
+    seen = {start}
+    queue = deque([start])
+    while queue and len(seen) < limit:
+        point = queue.popleft()
+        for dx, dy in DELTAS.values():
+            nxt = Point(point.x + dx * BLOCK_SIZE, point.y + dy * BLOCK_SIZE)
+            if nxt in seen or nxt in blocked:
+                continue
+            if nxt.x < 0 or nxt.x >= game.width or nxt.y < 0 or nxt.y >= game.height:
+                continue
+            seen.add(nxt)
+            queue.append(nxt)
+    return len(seen)
+
+
+def straight_policy(game):
+    """Keep going in the current direction"""
+    return game.direction
+
+
+def greedy_policy(game):
+    """Take the safe move that gets closest to the food"""
+    moves = _safe_moves(game)
+    if not moves:
+        return game.direction
+    return min(moves, key=lambda d: _distance_to_food(game, _next_point(game, d)))
+
+
+def flood_policy(game):
+    """Greedy, but avoid moves into areas too small to hold the snake"""
+    moves = _safe_moves(game)
+    if not moves:
+        return game.direction
+    limit = len(game.snake) + 1
+    areas = {d: _free_area(game, _next_point(game, d), limit) for d in moves}
+    roomy = [d for d in moves if areas[d] >= limit]
+    if roomy:
+        return min(roomy, key=lambda d: _distance_to_food(game, _next_point(game, d)))
+    return max(moves, key=lambda d: areas[d])
+
+
+POLICIES = {
+    'straight': straight_policy,
+    'greedy': greedy_policy,
+    'flood': flood_policy,
+}
+
+
+def load_policy(name):
+    """Look up a built-in policy or import one given as 'module:function'"""
+    if name in POLICIES:
+        return POLICIES[name]
+    if ':' not in name:
+        raise ValueError(f"Unknown policy {name!r}; use one of {sorted(POLICIES)} or 'module:function'")
+    module_name, func_name = name.split(':', 1)
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def play_game(policy, seed, width=640, height=480, max_ticks=MAX_TICKS):
+    """Run one headless game and return its result row"""
+    game = SnakeGame(width, height, rewind_ticks=1, headless=True, seed=seed)
+    death = 'timeout'
+    ticks = 0
+    while ticks < max_ticks:
+        ticks += 1
+        if game.step(policy(game)):
+            death = game._collision_cause()
+            break
+        if len(game.snake) == (width // BLOCK_SIZE) * (height // BLOCK_SIZE):
+            death = 'win'
+            break
+    # A crash leaves the colliding head in the body, so count the snake before it
+    length = len(game.snake) - 1 if death in ('wall', 'self') else len(game.snake)
+    return {'score': game.score, 'length': length, 'ticks': ticks, 'death': death}
+
+
+def _completed_games(path, width, height, max_ticks):
+    """Read (policy, seed) pairs already in the results file.
+
+    Raises ValueError if the file was written with different columns or
+    game settings, since its games would not be comparable with the ones
+    about to be played; the file is left untouched in that case. Otherwise
+    a line cut short by an interrupted run is truncated away so that new
+    rows are appended cleanly.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+
+    settings = (width, height, max_ticks)
+    with open(path, 'r', newline='') as f:
+        # Only whole lines count; a trailing partial row is dropped below
+        reader = csv.DictReader(line for line in f if line.endswith('\n'))
+        if reader.fieldnames is not None and reader.fieldnames != FIELDS:
+            raise ValueError(f"{path} has columns {reader.fieldnames}, expected {FIELDS}")
+        for row in reader:
+            found = (int(row['width']), int(row['height']), int(row['max_ticks']))
+            if found != settings:
+                raise ValueError(f"{path} holds games played with width, height, max_ticks = "
+                                 f"{found}, not {settings}; use a different results file")
+            done.add((row['policy'], int(row['seed'])))
+
+    _truncate_partial_line(path)
+    return done
+
+
+def _truncate_partial_line(path):
+    """Cut the file back to its last newline"""
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        end = 0
+        stop = size
+        while stop > 0:
+            start = max(0, stop - 4096)
+            f.seek(start)
+            newline = f.read(stop - start).rfind(b'\n')
+            if newline >= 0:
+                end = start + newline + 1
+                break
+            stop = start
+        if end < size:
+            f.truncate(end)
+
+
+def _play_task(task):
+    """Pool worker: play one (policy, seed) game and tag the result"""
+    name, policy, seed, width, height, max_ticks = task
+    return name, seed, play_game(policy, seed, width, height, max_ticks)
+
+
+def run_tournament(policies, seeds, path, width=640, height=480, max_ticks=MAX_TICKS,
+                   progress=None, jobs=1):
+    """Play every policy on every seed, appending one CSV row per game.
+
+    Games already present in the results file are skipped, so an interrupted
+    tournament resumes where it stopped. With jobs > 1 games are played in a
+    process pool (policies must then be importable module-level functions);
+    only this process writes rows, each as soon as its game finishes.
+    Returns the ranked summary.
+    """
+    done = _completed_games(path, width, height, max_ticks)
+    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+    tasks = ((name, policy, seed, width, height, max_ticks)
+             for seed in seeds
+             for name, policy in policies.items()
+             if (name, seed) not in done)
+
+    with open(path, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        if write_header:
+            writer.writeheader()
+            f.flush()
+
+        def record(results):
+            for name, seed, result in results:
+                writer.writerow(dict(result, policy=name, seed=seed, width=width,
+                                     height=height, max_ticks=max_ticks))
+                f.flush()
+                if progress:
+                    progress(name, seed, result)
+
+        if jobs > 1:
+            with multiprocessing.Pool(jobs) as pool:
+                record(pool.imap_unordered(_play_task, tasks))
+        else:
+            record(map(_play_task, tasks))
+
+    return summarize(path, policies, seeds)
+
+
+def summarize(path, policies=None, seeds=None):
+    """Rank policies by mean score, with a 95% confidence interval.
+
+    The results file is streamed, keeping only running totals per policy.
+    When given, only rows for the listed policies and seeds are counted, so
+    every policy is ranked on the same set of seeds.
+    """
+    if policies is not None:
+        policies = set(policies)
+    if seeds is not None:
+        seeds = set(seeds)
+    totals = {}
+    with open(path, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            if policies is not None and row['policy'] not in policies:
+                continue
+            if seeds is not None and int(row['seed']) not in seeds:
+                continue
+            t = totals.setdefault(row['policy'], {
+                'games': 0, 'score': 0, 'score_sq': 0, 'length': 0, 'ticks': 0, 'deaths': {},
+            })
+            score = int(row['score'])
+            t['games'] += 1
+            t['score'] += score
+            t['score_sq'] += score * score
+            t['length'] += int(row['length'])
+            t['ticks'] += int(row['ticks'])
+            t['deaths'][row['death']] = t['deaths'].get(row['death'], 0) + 1
+
+    summary = []
+    for name, t in totals.items():
+        n = t['games']
+        mean = t['score'] / n
+        variance = (t['score_sq'] - n * mean * mean) / (n - 1) if n > 1 else 0.0
+        margin = Z_95 * math.sqrt(max(variance, 0.0) / n)
+        summary.append({
+            'policy': name,
+            'games': n,
+            'mean_score': mean,
+            'ci_low': mean - margin,
+            'ci_high': mean + margin,
+            'mean_length': t['length'] / n,
+            'mean_ticks': t['ticks'] / n,
+            'deaths': t['deaths'],
+        })
+    summary.sort(key=lambda s: s['mean_score'], reverse=True)
+    return summary
+
+
+def format_summary(summary):
+    """Render the ranked summary as a text table"""
+    lines = [f"{'rank':>4}  {'policy':<20} {'games':>6} {'score':>8} {'95% CI':>17} "
+             f"{'length':>7} {'ticks':>8}  deaths"]
+    for rank, s in enumerate(summary, 1):
+        deaths = ', '.join(f"{cause}={count}" for cause, count in sorted(s['deaths'].items()))
+        ci = f"[{s['ci_low']:.2f}, {s['ci_high']:.2f}]"
+        lines.append(f"{rank:>4}  {s['policy']:<20} {s['games']:>6} {s['mean_score']:>8.2f} {ci:>17} "
+                     f"{s['mean_length']:>7.1f} {s['mean_ticks']:>8.1f}  {deaths}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """Command line entry point for running a tournament"""
+    parser = argparse.ArgumentParser(description='Run bot policies over fixed seeds.')
+    parser.add_argument('--policies', default=','.join(POLICIES),
+                        help="comma separated built-in names or 'module:function' specs")
+    parser.add_argument('--seeds', type=int, default=1000, help='number of seeds to play')
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--out', default='tournament.csv', help='CSV results file (resumed if present)')
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--max-ticks', type=int, default=MAX_TICKS)
+    parser.add_argument('--jobs', type=int, default=1, help='games played in parallel')
+    args = parser.parse_args(argv)
+
+    policies = {name: load_policy(name) for name in args.policies.split(',') if name}
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    try:
+        summary = run_tournament(policies, seeds, args.out, args.width, args.height,
+                                 args.max_ticks, jobs=args.jobs)
+    except ValueError as e:
+        parser.error(str(e))
+    print(format_summary(summary))
+
+
+if __name__ == '__main__':
+    main()
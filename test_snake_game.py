@@ -4,6 +4,8 @@ from unittest.mock import Mock, patch
 from enum import Enum
 from collections import namedtuple
 import sys
+import os
+import tempfile
 
 # Mock pygame before importing snake_game
 mock_pygame = Mock()
@@ -29,7 +31,9 @@ mock_pygame.draw.rect = Mock()
 
 # Import the game module after mocking
 import snake_game
-from snake_game import SnakeGame, Direction, Point, BLOCK_SIZE
+from snake_game import SnakeGame, TickScheduler, Direction, Point, BLOCK_SIZE
+from snake_solver import SnakeSolver
+import snake_tournament
 
 class TestSnakeGame(unittest.TestCase):
     def setUp(self):
@@ -372,6 +376,29 @@ class TestSnakeGame(unittest.TestCase):
         
         self.assertEqual(len(self.game.snake), initial_length)
 
+    def test_collision_cause_wall(self):
+        """Collision cause reports walls"""
+        self.assertEqual(self.game._collision_cause(Point(-BLOCK_SIZE, 100)), 'wall')
+
+    def test_collision_cause_self(self):
+        """Collision cause reports the snake's own body"""
+        self.game.snake = [Point(100, 100), Point(120, 100), Point(140, 100)]
+        self.assertEqual(self.game._collision_cause(Point(120, 100)), 'self')
+        self.assertIsNone(self.game._collision_cause(Point(200, 200)))
+
+    def test_seeded_food_is_repeatable(self):
+        """Games with the same seed place food identically"""
+        first = SnakeGame(seed=42)
+        second = SnakeGame(seed=42)
+        self.assertEqual(first.food, second.food)
+
+    def test_no_food_when_board_full(self):
+        """Food is cleared once the snake covers the board"""
+        game = SnakeGame(width=2 * BLOCK_SIZE, height=2 * BLOCK_SIZE)
+        game.snake = [Point(0, 0), Point(20, 0), Point(20, 20), Point(0, 20)]
+        game._place_food()
+        self.assertIsNone(game.food)
+
 
 class TestScorePersistence(unittest.TestCase):
     """Tests for score loading and saving functionality"""
@@ -424,5 +451,486 @@ class TestScorePersistence(unittest.TestCase):
         self.assertEqual(game.last_score, 0)
 
 
+class TestRewind(unittest.TestCase):
+    """Tests for the per-tick delta history and rewind"""
+
+    def setUp(self):
+        mock_pygame.reset_mock()
+        mock_pygame.event.get.return_value = []
+        self.game = SnakeGame()
+
+    def snapshot(self):
+        return (list(self.game.snake), self.game.head, self.game.direction,
+                self.game.food, self.game.score)
+
+    def test_rewind_plain_move(self):
+        """Rewinding a move restores the popped tail"""
+        self.game.food = Point(0, 0)
+        before = self.snapshot()
+        self.game.step(Direction.UP)
+        self.assertEqual(self.game.rewind(), 1)
+        self.assertEqual(self.snapshot(), before)
+
+    def test_rewind_eating(self):
+        """Rewinding a meal shrinks the snake and restores the old food and score"""
+        self.game.food = Point(self.game.head.x + BLOCK_SIZE, self.game.head.y)
+        before = self.snapshot()
+        self.game.play_step()
+        self.assertEqual(self.game.score, 1)
+        self.game.rewind()
+        self.assertEqual(self.snapshot(), before)
+
+    def test_rewind_restores_food_sequence(self):
+        """Eating again after rewinding a meal places the same new food"""
+        self.game = SnakeGame(seed=5)
+        self.game.food = Point(self.game.head.x + BLOCK_SIZE, self.game.head.y)
+        self.game.step(Direction.RIGHT)
+        placed = self.game.food
+        self.game.rewind()
+        self.game.step(Direction.RIGHT)
+        self.assertEqual(self.game.food, placed)
+
+    def test_meal_delta_stays_small(self):
+        """A meal tick records only the meal count, not an RNG state"""
+        self.game.food = Point(self.game.head.x + BLOCK_SIZE, self.game.head.y)
+        self.game.step(Direction.RIGHT)
+        delta = self.game.history[-1]
+        self.assertEqual(delta.meals, 0)
+        self.assertEqual(self.game.meals, 1)
+        self.game.rewind()
+        self.assertEqual(self.game.meals, 0)
+
+    def test_unseeded_reset_draws_new_seed(self):
+        """Games without a fixed seed get a fresh food sequence per round"""
+        with patch('random.getrandbits', side_effect=[1, 2]):
+            self.game.reset()
+            first = self.game.seed
+            self.game.reset()
+        self.assertNotEqual(first, self.game.seed)
+        self.assertEqual(SnakeGame(seed=9).seed, 9)
+
+    def test_rewind_collision(self):
+        """Rewinding a fatal tick brings the snake back to life"""
+        self.game.head = Point(self.game.width - BLOCK_SIZE, 100)
+        self.game.snake = [self.game.head, Point(self.game.head.x - BLOCK_SIZE, 100)]
+        self.game.food = Point(0, 0)
+        before = self.snapshot()
+        game_over, _ = self.game.play_step()
+        self.assertTrue(game_over)
+        self.game.rewind()
+        self.assertEqual(self.snapshot(), before)
+        self.assertFalse(self.game._is_collision())
+
+    def test_rewind_many_ticks(self):
+        """Rewinding N ticks undoes them in reverse order"""
+        self.game.food = Point(0, 0)
+        before = self.snapshot()
+        for direction in (Direction.UP, Direction.RIGHT, Direction.DOWN, Direction.DOWN):
+            self.game.step(direction)
+        self.assertEqual(self.game.rewind(4), 4)
+        self.assertEqual(self.snapshot(), before)
+
+    def test_rewind_limited_by_history(self):
+        """Rewind stops at the oldest retained tick"""
+        self.game = SnakeGame(rewind_ticks=2)
+        self.game.food = Point(0, 0)
+        for _ in range(3):
+            self.game.step()
+        self.assertEqual(len(self.game.history), 2)
+        self.assertEqual(self.game.rewind(5), 2)
+        self.assertEqual(self.game.rewind(), 0)
+
+    def test_reset_clears_history(self):
+        """Reset starts a fresh history"""
+        self.game.food = Point(0, 0)
+        self.game.step()
+        self.game.reset()
+        self.assertEqual(len(self.game.history), 0)
+
+
+class TestTickScheduler(unittest.TestCase):
+    """Tests for adaptive speed and tick pacing"""
+
+    def setUp(self):
+        mock_pygame.reset_mock()
+        self.now = 0.0
+        self.clock = Mock()
+        self.scheduler = TickScheduler(self.clock, base_speed=8, speed_step=2,
+                                       points_per_level=5, max_speed=30,
+                                       time_func=lambda: self.now)
+
+    def frame(self, cost, score=0):
+        """Spend `cost` seconds on a frame, then let the clock pace to 1/speed"""
+        deadline = self.now + 1.0 / self.scheduler.speed(score)
+        self.now += cost
+
+        def tick(fps):
+            self.now = max(self.now, deadline)
+
+        self.clock.tick.side_effect = tick
+        self.clock.tick_busy_loop.side_effect = tick
+        rendered = self.scheduler.should_render()
+        self.scheduler.wait(score)
+        return rendered
+
+    def test_speed_rises_per_level(self):
+        """Speed increases every level and is capped"""
+        self.assertEqual(self.scheduler.level(0), 1)
+        self.assertEqual(self.scheduler.speed(0), 8)
+        self.assertEqual(self.scheduler.level(5), 2)
+        self.assertEqual(self.scheduler.speed(5), 10)
+        self.assertEqual(self.scheduler.speed(1000), 30)
+
+    def test_busy_loop_at_high_speed(self):
+        """Fast rates use the busy-wait tick, slow rates the sleeping one"""
+        self.scheduler.wait(0)
+        self.clock.tick.assert_called_once_with(8)
+        self.scheduler.wait(1000)
+        self.clock.tick_busy_loop.assert_called_once_with(30)
+
+    def test_overrun_skips_render_not_logic(self):
+        """After a slow frame the next render is dropped but the tick still runs"""
+        self.frame(0.01)
+        self.assertTrue(self.frame(0.5))
+        ticks = self.scheduler.ticks
+        self.assertFalse(self.frame(0.01))
+        self.assertEqual(self.scheduler.ticks, ticks + 1)
+        self.assertEqual(self.scheduler.renders_skipped, 1)
+        self.assertEqual(self.scheduler.overruns, 1)
+        self.assertTrue(self.frame(0.01))
+
+    def test_skipped_renders_are_bounded(self):
+        """Rendering resumes after too many skipped frames in a row"""
+        rendered = [self.frame(1.0) for _ in range(10)]
+        self.assertIn(True, rendered[2:])
+
+    def test_jitter_report(self):
+        """Jitter report reflects the measured tick intervals"""
+        for _ in range(5):
+            self.frame(0.01)
+        report = self.scheduler.jitter_report()
+        self.assertEqual(report['ticks'], 5)
+        self.assertAlmostEqual(report['mean_interval_ms'], 125.0)
+        self.assertAlmostEqual(report['jitter_ms'], 0.0)
+        self.assertAlmostEqual(report['mean_frame_cost_ms'], 10.0)
+
+    def test_jitter_ignores_speed_changes(self):
+        """Perfect pacing reports no jitter while speed rises with score"""
+        for score in range(0, 60, 2):
+            self.frame(0.01, score)
+        report = self.scheduler.jitter_report()
+        self.assertAlmostEqual(report['jitter_ms'], 0.0)
+        self.assertAlmostEqual(report['max_deviation_ms'], 0.0)
+        self.assertAlmostEqual(report['mean_error_ms'], 0.0)
+
+    def test_jitter_measures_late_ticks(self):
+        """A tick that lands late shows up as pacing error"""
+        for _ in range(3):
+            self.frame(0.01)
+        self.frame(0.2)
+        report = self.scheduler.jitter_report()
+        self.assertAlmostEqual(report['max_deviation_ms'], 75.0)
+        self.assertGreater(report['jitter_ms'], 0.0)
+
+    def test_pause_excluded_from_report(self):
+        """A pause between ticks is neither an interval, a frame cost nor an overrun"""
+        for _ in range(3):
+            self.frame(0.01)
+        self.now += 10.0
+        self.scheduler.pause()
+        rendered = [self.frame(0.01) for _ in range(3)]
+        self.assertEqual(rendered, [True, True, True])
+        report = self.scheduler.jitter_report()
+        self.assertEqual(report['overruns'], 0)
+        self.assertEqual(report['renders_skipped'], 0)
+        self.assertAlmostEqual(report['mean_interval_ms'], 125.0)
+        self.assertAlmostEqual(report['jitter_ms'], 0.0)
+        self.assertAlmostEqual(report['max_deviation_ms'], 0.0)
+        self.assertAlmostEqual(report['max_frame_cost_ms'], 10.0)
+
+    def test_game_reset_pauses_scheduler(self):
+        """Starting a new game clears the scheduler's last tick"""
+        game = SnakeGame()
+        game.scheduler.last_tick = 123.0
+        game.scheduler.behind = True
+        game.reset()
+        self.assertIsNone(game.scheduler.last_tick)
+        self.assertFalse(game.scheduler.behind)
+
+    def test_game_uses_scheduler(self):
+        """play_step paces through the game's scheduler"""
+        game = SnakeGame(speed=12)
+        game.food = Point(9999, 9999)
+        mock_pygame.event.get.return_value = []
+        game.scheduler.wait = Mock()
+        game.play_step()
+        game.scheduler.wait.assert_called_once_with(0)
+        self.assertEqual(game.scheduler.speed(0), 12)
+
+
+class TestSnakeSolver(unittest.TestCase):
+    """Tests for the small-board perfect-play solver"""
+
+    def setUp(self):
+        mock_pygame.reset_mock()
+        # 4x4 board with the snake along the top row
+        self.game = SnakeGame(width=4 * BLOCK_SIZE, height=4 * BLOCK_SIZE)
+        self.game.snake = [Point(40, 0), Point(20, 0), Point(0, 0)]
+        self.game.head = self.game.snake[0]
+        self.game.food = Point(0, 60)
+
+    def test_seeded_solve_finds_win(self):
+        """With fixed-seed food the solver fills a 4x4 board"""
+        result = SnakeSolver(self.game, chance='seed').solve()
+        self.assertTrue(result.complete)
+        self.assertTrue(result.win)
+        self.assertEqual(result.score, 16 - 3)
+        self.assertIsNotNone(result.direction)
+
+    def test_score_includes_current_score(self):
+        """Reported score adds to the game's current score"""
+        self.game.score = 7
+        result = SnakeSolver(self.game).solve()
+        self.assertEqual(result.score, 7 + 16 - 3)
+
+    def test_trapped_snake_scores_nothing(self):
+        """A snake with no safe move has no direction and no extra points"""
+        # Head in the corner, boxed in by its own body
+        self.game.snake = [Point(0, 0), Point(20, 0), Point(20, 20), Point(0, 20)]
+        self.game.head = self.game.snake[0]
+        self.game.food = Point(60, 60)
+        result = SnakeSolver(self.game).solve()
+        self.assertEqual(result.score, 0)
+        self.assertFalse(result.win)
+        self.assertIsNone(result.direction)
+
+    def test_seeded_food_matches_game(self):
+        """Seed mode predicts the food the game places after a meal"""
+        game = SnakeGame(width=4 * BLOCK_SIZE, height=4 * BLOCK_SIZE, seed=3)
+        game.snake = [Point(40, 0), Point(20, 0), Point(0, 0)]
+        game.head = game.snake[0]
+        game.food = Point(60, 0)
+        solver = SnakeSolver(game)
+        for _ in range(2):
+            ate = (solver._cell(game.food),) + tuple(solver._cell(p) for p in game.snake)
+            game.step(Direction.RIGHT if game.head.x < 60 else Direction.DOWN)
+            self.assertEqual(solver._seeded_food(ate), solver._cell(game.food))
+            game.food = Point(60, game.head.y + BLOCK_SIZE)
+
+    def test_full_board_is_a_win(self):
+        """A snake filling the board has no food and has already won"""
+        game = SnakeGame(width=2 * BLOCK_SIZE, height=2 * BLOCK_SIZE)
+        game.snake = [Point(0, 0), Point(20, 0), Point(20, 20), Point(0, 20)]
+        game.head = game.snake[0]
+        game.score = 1
+        game._place_food()
+        result = SnakeSolver(game).solve()
+        self.assertEqual(result, (1, True, None, True))
+
+    def test_worst_case_never_beats_expected(self):
+        """Guaranteed score is a lower bound on the expected score"""
+        game = SnakeGame(width=3 * BLOCK_SIZE, height=3 * BLOCK_SIZE)
+        game.snake = [Point(40, 0), Point(20, 0), Point(0, 0)]
+        game.head = game.snake[0]
+        game.food = Point(0, 40)
+        worst = SnakeSolver(game, chance='worst').solve()
+        expected = SnakeSolver(game, chance='expected').solve()
+        self.assertLessEqual(worst.score, expected.score)
+
+    def test_table_respects_memory_cap(self):
+        """Transposition table never grows past max_entries"""
+        solver = SnakeSolver(self.game, chance='worst', max_entries=50, max_nodes=5000)
+        solver.solve()
+        self.assertLessEqual(len(solver.table), 50)
+        self.assertGreater(solver.stats.evictions, 0)
+
+    def test_position_cap_bounds_search_memory(self):
+        """In-progress search sets never grow past max_positions"""
+        solver = SnakeSolver(self.game, chance='worst', max_positions=20)
+        result = solver.solve()
+        self.assertFalse(result.complete)
+        self.assertLessEqual(solver.stats.peak_positions, 21)
+        self.assertEqual(solver.stats.positions, 0)
+
+    def test_cache_hits_on_repeat_solve(self):
+        """A second solve is answered from the transposition table"""
+        solver = SnakeSolver(self.game)
+        first = solver.solve()
+        nodes = solver.stats.nodes
+        second = solver.solve()
+        self.assertEqual(first, second)
+        self.assertEqual(solver.stats.nodes, nodes)
+        self.assertGreater(solver.stats.hit_rate, 0)
+
+    def test_node_budget_marks_incomplete(self):
+        """Hitting max_nodes returns a partial result"""
+        solver = SnakeSolver(self.game, chance='worst', max_nodes=10)
+        result = solver.solve()
+        self.assertFalse(result.complete)
+
+    def test_progress_callback(self):
+        """Progress callback receives the running stats"""
+        reports = []
+        SnakeSolver(self.game, progress=reports.append, progress_interval=5).solve()
+        self.assertTrue(reports)
+        self.assertGreater(reports[-1].nodes, 0)
+
+    def test_invalid_chance_mode(self):
+        """Unknown chance modes are rejected"""
+        with self.assertRaises(ValueError):
+            SnakeSolver(self.game, chance='random')
+
+    def test_zobrist_hash_depends_on_body_order(self):
+        """Same cells in a different order hash differently"""
+        solver = SnakeSolver(self.game)
+        self.assertNotEqual(solver._hash((1, 0, 4), 15), solver._hash((4, 0, 1), 15))
+        self.assertNotEqual(solver._hash((1, 0, 4), 15), solver._hash((1, 0, 4), 14))
+
+
+class TestTournament(unittest.TestCase):
+    """Tests for the headless policy tournament"""
+
+    def setUp(self):
+        mock_pygame.reset_mock()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'results.csv')
+        self.size = 8 * BLOCK_SIZE
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_games(self, seeds, policies=None, progress=None):
+        policies = policies or {'straight': snake_tournament.straight_policy,
+                                'greedy': snake_tournament.greedy_policy}
+        return snake_tournament.run_tournament(policies, seeds, self.path, self.size, self.size,
+                                               max_ticks=500, progress=progress)
+
+    def read_rows(self):
+        with open(self.path) as f:
+            return f.read().splitlines()
+
+    def test_headless_game_does_not_open_display(self):
+        """Headless games never touch the display"""
+        SnakeGame(headless=True)
+        mock_pygame.display.set_mode.assert_not_called()
+
+    def test_straight_policy_hits_wall(self):
+        """Going straight ends at the wall with no score"""
+        result = snake_tournament.play_game(snake_tournament.straight_policy, 0, self.size, self.size)
+        self.assertEqual(result['death'], 'wall')
+        self.assertEqual(result['score'], 0)
+        self.assertEqual(result['length'], 3)
+        self.assertEqual(result['ticks'], 4)
+
+    def test_play_game_is_deterministic(self):
+        """Same policy and seed give the same result"""
+        first = snake_tournament.play_game(snake_tournament.flood_policy, 3, self.size, self.size)
+        second = snake_tournament.play_game(snake_tournament.flood_policy, 3, self.size, self.size)
+        self.assertEqual(first, second)
+
+    def test_timeout(self):
+        """Games are stopped after max_ticks"""
+        result = snake_tournament.play_game(snake_tournament.greedy_policy, 0, self.size, self.size,
+                                            max_ticks=1)
+        self.assertEqual(result['death'], 'timeout')
+        self.assertEqual(result['ticks'], 1)
+
+    def test_results_streamed_per_game(self):
+        """One row per policy and seed follows the header"""
+        self.run_games(range(5))
+        rows = self.read_rows()
+        self.assertEqual(rows[0], ','.join(snake_tournament.FIELDS))
+        self.assertEqual(len(rows), 1 + 2 * 5)
+
+    def test_resume_skips_finished_games(self):
+        """A rerun only plays games missing from the results file"""
+        self.run_games(range(3))
+        played = []
+        self.run_games(range(5), progress=lambda name, seed, result: played.append((name, seed)))
+        self.assertEqual(sorted(seed for _, seed in played), [3, 3, 4, 4])
+        self.assertEqual(len(self.read_rows()), 1 + 2 * 5)
+
+    def test_resume_drops_partial_line(self):
+        """A row cut short by an interruption is replayed"""
+        self.run_games(range(2))
+        with open(self.path, 'a') as f:
+            f.write('greedy,2,1')
+        self.run_games(range(3))
+        rows = self.read_rows()
+        self.assertEqual(len(rows), 1 + 2 * 3)
+        self.assertNotIn('greedy,2,1', rows)
+
+    def test_resume_refuses_different_settings(self):
+        """Results from another board size or tick limit are not reused"""
+        self.run_games(range(2))
+        with self.assertRaises(ValueError):
+            snake_tournament.run_tournament({'greedy': snake_tournament.greedy_policy}, range(2),
+                                            self.path, 640, 480, max_ticks=500)
+        with self.assertRaises(ValueError):
+            snake_tournament.run_tournament({'greedy': snake_tournament.greedy_policy}, range(2),
+                                            self.path, self.size, self.size, max_ticks=100)
+        self.assertEqual(len(self.read_rows()), 1 + 2 * 2)
+
+    def test_refused_resume_leaves_file_untouched(self):
+        """A results file with other settings is not truncated"""
+        self.run_games(range(1))
+        with open(self.path, 'a') as f:
+            f.write('greedy,1,1')
+        with open(self.path) as f:
+            before = f.read()
+        with self.assertRaises(ValueError):
+            snake_tournament.run_tournament({'greedy': snake_tournament.greedy_policy}, range(2),
+                                            self.path, self.size, self.size, max_ticks=100)
+        with open(self.path) as f:
+            self.assertEqual(f.read(), before)
+
+    def test_resume_refuses_old_columns(self):
+        """A results file with a different header is not appended to"""
+        with open(self.path, 'w') as f:
+            f.write('policy,seed,score,length,ticks,death\n')
+        with self.assertRaises(ValueError):
+            self.run_games(range(1))
+
+    def test_summary_ranked_with_confidence_interval(self):
+        """Summary ranks by mean score and brackets the mean"""
+        summary = self.run_games(range(10))
+        self.assertEqual([s['policy'] for s in summary], ['greedy', 'straight'])
+        for s in summary:
+            self.assertEqual(s['games'], 10)
+            self.assertLessEqual(s['ci_low'], s['mean_score'])
+            self.assertGreaterEqual(s['ci_high'], s['mean_score'])
+        self.assertEqual(summary[1]['deaths'], {'wall': 10})
+        self.assertIn('greedy', snake_tournament.format_summary(summary))
+
+    def test_summary_limited_to_current_run(self):
+        """Rows from other policies or seeds in the file are not ranked"""
+        self.run_games(range(5))
+        summary = self.run_games(range(2), policies={'flood': snake_tournament.flood_policy})
+        self.assertEqual([s['policy'] for s in summary], ['flood'])
+        self.assertEqual(summary[0]['games'], 2)
+        full = snake_tournament.summarize(self.path)
+        self.assertEqual(sorted(s['policy'] for s in full), ['flood', 'greedy', 'straight'])
+
+    def test_parallel_jobs_match_serial(self):
+        """A process pool writes the same games as a serial run"""
+        serial = self.run_games(range(4))
+        os.remove(self.path)
+        self.run_games(range(2))
+        parallel = snake_tournament.run_tournament(
+            {'straight': snake_tournament.straight_policy,
+             'greedy': snake_tournament.greedy_policy},
+            range(4), self.path, self.size, self.size, max_ticks=500, jobs=2)
+        self.assertEqual(parallel, serial)
+        self.assertEqual(len(self.read_rows()), 1 + 2 * 4)
+
+    def test_load_policy(self):
+        """Policies resolve by built-in name or module:function"""
+        self.assertIs(snake_tournament.load_policy('greedy'), snake_tournament.greedy_policy)
+        self.assertIs(snake_tournament.load_policy('snake_tournament:flood_policy'),
+                      snake_tournament.flood_policy)
+        with self.assertRaises(ValueError):
+            snake_tournament.load_policy('nonexistent')
+
+
 if __name__ == '__main__':
     unittest.main()